@@ -0,0 +1,290 @@
+"""
+Lazy NBT reader used by schemInfoPy.py
+
+Walks uncompressed big-endian NBT data in place and only records where each
+tag of a compound lives. Values are decoded into the matching nbtlib tags when
+they are looked up, so large arrays and subtrees that are never inspected are
+never copied.
+"""
+import struct
+from collections import namedtuple
+from io import BytesIO
+
+import numpy as np
+import nbtlib
+
+# NBT tag ids
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+BYTE = struct.Struct('>b')
+SHORT = struct.Struct('>h')
+USHORT = struct.Struct('>H')
+INT = struct.Struct('>i')
+LONG = struct.Struct('>q')
+FLOAT = struct.Struct('>f')
+DOUBLE = struct.Struct('>d')
+
+# Structs used to decode the fixed size tags
+SCALARS = {
+    TAG_BYTE: BYTE,
+    TAG_SHORT: SHORT,
+    TAG_INT: INT,
+    TAG_LONG: LONG,
+    TAG_FLOAT: FLOAT,
+    TAG_DOUBLE: DOUBLE,
+}
+
+# Size in bytes of a single element of the array tags
+ARRAY_ITEM_SIZES = {
+    TAG_BYTE_ARRAY: 1,
+    TAG_INT_ARRAY: 4,
+    TAG_LONG_ARRAY: 8,
+}
+
+# nbtlib classes the decoded values are wrapped in
+TAG_CLASSES = {
+    TAG_BYTE: nbtlib.Byte,
+    TAG_SHORT: nbtlib.Short,
+    TAG_INT: nbtlib.Int,
+    TAG_LONG: nbtlib.Long,
+    TAG_FLOAT: nbtlib.Float,
+    TAG_DOUBLE: nbtlib.Double,
+    TAG_BYTE_ARRAY: nbtlib.ByteArray,
+    TAG_STRING: nbtlib.String,
+    TAG_INT_ARRAY: nbtlib.IntArray,
+    TAG_LONG_ARRAY: nbtlib.LongArray,
+}
+
+# Position of a tag payload inside the buffer
+Entry = namedtuple('Entry', ['tag_id', 'offset', 'length'])
+
+def read_string(buffer, offset):
+    """Reads a string at the given offset, returns the string and the offset after it"""
+    end = offset + 2 + USHORT.unpack_from(buffer, offset)[0]
+    return str(buffer[offset + 2:end], 'utf-8', 'replace'), end
+
+def skip_fixed(size):
+    """Creates a skip function for a tag with a fixed size payload"""
+    return lambda buffer, offset: offset + size
+
+def skip_array(item_size):
+    """Creates a skip function for an array tag with the given element size"""
+    def skip(buffer, offset):
+        count = INT.unpack_from(buffer, offset)[0]
+        if count < 0:
+            raise ValueError(f"Negative array length: {count}")
+        return offset + 4 + count * item_size
+    return skip
+
+def skip_string(buffer, offset):
+    """Skips over a string payload"""
+    return offset + 2 + USHORT.unpack_from(buffer, offset)[0]
+
+def skip_list(buffer, offset):
+    """Skips over a list payload"""
+    item_id = buffer[offset]
+    count = INT.unpack_from(buffer, offset + 1)[0]
+    offset += 5
+    if count <= 0:
+        return offset
+    if item_id in SCALARS:
+        return offset + count * SCALARS[item_id].size
+    for _ in range(count):
+        offset = skip_tag(item_id, buffer, offset)
+    return offset
+
+def skip_compound(buffer, offset):
+    """Skips over a compound payload"""
+    while True:
+        tag_id = buffer[offset]
+        offset += 1
+        if tag_id == TAG_END:
+            return offset
+        offset = skip_string(buffer, offset)
+        offset = skip_tag(tag_id, buffer, offset)
+
+# Dispatch table returning the offset right after a tag payload
+SKIP = {
+    TAG_STRING: skip_string,
+    TAG_LIST: skip_list,
+    TAG_COMPOUND: skip_compound,
+}
+SKIP.update((tag_id, skip_fixed(fmt.size)) for tag_id, fmt in SCALARS.items())
+SKIP.update((tag_id, skip_array(item_size)) for tag_id, item_size in ARRAY_ITEM_SIZES.items())
+
+def skip_tag(tag_id, buffer, offset):
+    """Returns the offset right after the payload of a tag"""
+    try:
+        skip = SKIP[tag_id]
+    except KeyError:
+        raise ValueError(f"Unknown tag id: {tag_id}")
+    end = skip(buffer, offset)
+    if end > len(buffer):
+        raise ValueError("Tag extends past the end of the data")
+    return end
+
+def decode_tag(buffer, entry):
+    """Decodes the tag described by an entry into the matching nbtlib tag"""
+    tag_id, offset, length = entry
+    if tag_id in SCALARS:
+        return TAG_CLASSES[tag_id](SCALARS[tag_id].unpack_from(buffer, offset)[0])
+    if tag_id == TAG_STRING:
+        return nbtlib.String(read_string(buffer, offset)[0])
+    if tag_id == TAG_COMPOUND:
+        return LazyCompound(buffer, offset)
+    if tag_id in ARRAY_ITEM_SIZES:
+        # The array is a view over the buffer, nothing is copied
+        tag_class = TAG_CLASSES[tag_id]
+        count = INT.unpack_from(buffer, offset)[0]
+        return tag_class(np.frombuffer(buffer, tag_class.item_type['big'], count, offset + 4))
+    # Lists are small at the levels that get inspected, let nbtlib decode them
+    return nbtlib.List.parse(BytesIO(buffer[offset:offset + length]))
+
+class LazyCompound(nbtlib.Compound):
+    """
+    Read-only compound that maps each key to the position of its value and decodes it on lookup
+
+    Every method that hands out values decodes them, so the stored entries never
+    leak out. Subclassing nbtlib.Compound makes comparisons against nbtlib
+    compounds go through __eq__ here. Mutating the compound raises a TypeError.
+    """
+
+    def __init__(self, buffer, offset):
+        dict.__init__(self)
+        self.buffer = buffer
+        while True:
+            tag_id = buffer[offset]
+            offset += 1
+            if tag_id == TAG_END:
+                break
+            name, offset = read_string(buffer, offset)
+            end = skip_tag(tag_id, buffer, offset)
+            dict.__setitem__(self, name, Entry(tag_id, offset, end - offset))
+            offset = end
+        self.end = offset
+
+    def value_len(self, key):
+        """Returns len() of a value or None if it has no length, arrays and lists are measured from their header"""
+        entry = dict.__getitem__(self, key)
+        if entry.tag_id in ARRAY_ITEM_SIZES:
+            return INT.unpack_from(self.buffer, entry.offset)[0]
+        if entry.tag_id == TAG_LIST:
+            return max(INT.unpack_from(self.buffer, entry.offset + 1)[0], 0)
+        value = decode_tag(self.buffer, entry)
+        return len(value) if hasattr(value, '__len__') else None
+
+    def __getitem__(self, key):
+        return decode_tag(self.buffer, dict.__getitem__(self, key))
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        entry = dict.get(self, key)
+        if entry is None:
+            return default
+        return decode_tag(self.buffer, entry)
+
+    def values(self):
+        for entry in dict.values(self):
+            yield decode_tag(self.buffer, entry)
+
+    def items(self):
+        for key, entry in dict.items(self):
+            yield key, decode_tag(self.buffer, entry)
+
+    def __iter__(self):
+        # Overriding __iter__ also stops dict(), update() and ** from copying the raw entries
+        return iter(dict.keys(self))
+
+    def __repr__(self):
+        return f"Compound({dict(self.items())!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            return dict(self.items()) == dict(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __or__(self, other):
+        if isinstance(other, dict):
+            return dict(self.items()) | other
+        return NotImplemented
+
+    def __ror__(self, other):
+        if isinstance(other, dict):
+            return other | dict(self.items())
+        return NotImplemented
+
+    def __reduce__(self):
+        # Pickle as a plain dict of decoded values, the buffer stays behind
+        return (dict, (dict(self.items()),))
+
+    def copy(self):
+        """Returns a plain dict of the decoded values"""
+        return dict(self.items())
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+class LazyFile(LazyCompound, nbtlib.File):
+    """Root compound of lazily read NBT data"""
+
+    # The reader only ever sees decompressed big-endian data
+    filename = None
+    gzipped = False
+    byteorder = 'big'
+
+    def __init__(self, buffer):
+        if buffer[0] != TAG_COMPOUND:
+            raise ValueError(f"Non-Compound root tags is not supported: {buffer[0]}")
+        self.root_name, offset = read_string(buffer, 1)
+        super().__init__(buffer, offset)
+
+    def __eq__(self, other):
+        result = super().__eq__(other)
+        if result is NotImplemented:
+            return result
+        return result and self.root_name == getattr(other, 'root_name', self.root_name)
+
+    def __repr__(self):
+        return f"<File {self.root_name!r}: {dict(self.items())!r}>"
+
+def detach(value):
+    """Returns a value that doesn't reference the buffer, arrays and compounds are copied"""
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, LazyCompound):
+        return nbtlib.Compound({key: detach(item) for key, item in value.items()})
+    return value
+
+def parse(buffer):
+    """
+    Lazily parses uncompressed NBT data
+
+    Args:
+        buffer: bytes, bytearray or memoryview holding the data, it must stay
+            alive as long as the returned compound is used
+
+    Returns:
+        LazyFile: The root compound
+    """
+    return LazyFile(buffer)
@@ -1,23 +1,106 @@
 #!/usr/bin/env python3
+# The module is annotated so it can be compiled with mypyc for speed:
+#   pip install mypy && mypyc --ignore-missing-imports schemInfoPy.py
+# The compiled module is only picked up on import, so run it with
+#   python -c "import schemInfoPy; schemInfoPy.main()" <args>
+# Without the compiled module this file works as is.
 import os
 import sys
+import io
 import gzip
+import mmap
 import json
 import datetime
+import threading
 import nbtlib
+import nbt_lazy
 import traceback
 from pathlib import Path
-from io import BytesIO
+from functools import partial
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, TextIO, Tuple, Union
 
-def safe_to_string(value):
+try:
+    # orjson is a much faster JSON encoder, install it with `pip install orjson`
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    # ISA-L's vectorized inflate is a lot faster than zlib, install it with `pip install isal`
+    from isal import isal_zlib as _zl
+except ImportError:
+    import zlib as _zl
+
+# Set SCHEM_DEBUG to include tracebacks in the output of failed files
+DEBUG = bool(os.environ.get('SCHEM_DEBUG'))
+
+# Size of the chunks fed to the decompressor
+READ_BUFFER_SIZE = 128 * 1024
+
+# Buffer size of the log file, so a batch turns into a few large writes
+LOG_BUFFER_SIZE = 64 * 1024
+
+# File extensions picked up when processing a directory
+SUPPORTED_EXTENSIONS = frozenset(('.schem', '.schematic', '.litematic'))
+
+# Top level keys that identify the schematic formats
+MODERN_KEYS = frozenset(('Palette', 'BlockData'))
+ALTERNATE_KEYS = frozenset(('BlockData', 'blocks'))
+CLASSIC_KEYS = frozenset(('Blocks', 'Data'))
+
+# First two bytes of every gzip stream
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Initial size of the decompression buffer reused across files
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Decompression buffers of each thread, worker processes get their own copy of the module
+_buffers = threading.local()
+
+# zlib window bits that make the decompressor expect a gzip header and trailer
+GZIP_WBITS = 16 + _zl.MAX_WBITS
+
+def dump_json(obj):
+    """Encodes an object as UTF-8 JSON indented by 2 spaces"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+class JsonArrayWriter:
+    """Writes a JSON array to a binary file one item at a time, laid out like json.dump with indent=2"""
+    
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+    
+    def write(self, item):
+        self.f.write(b",\n  " if self.count else b"[\n  ")
+        self.f.write(dump_json(item).replace(b"\n", b"\n  "))
+        self.count += 1
+    
+    def close(self):
+        self.f.write(b"\n]" if self.count else b"[]")
+
+def safe_to_string(value: Any) -> str:
     """Safely converts a value that might be a large number to a string"""
     if isinstance(value, (int, float)):
         return str(value)
     return str(value)
 
-def format_coordinates(obj):
+def is_compound(obj: Any) -> bool:
+    """
+    Checks if an object is an NBT compound, nbtlib and lazy compounds both subclass dict
+    
+    This is a function rather than an inline isinstance so mypyc doesn't narrow the type
+    to dict and call the dict methods directly, which would skip LazyCompound's get()
+    """
+    return isinstance(obj, dict)
+
+def format_coordinates(obj: Any) -> str:
     """Safely formats an NBT object that might contain coordinates"""
-    if not obj or not isinstance(obj, dict):
+    if not obj or not is_compound(obj):
         return 'unknown'
     
     try:
@@ -28,154 +111,260 @@ def format_coordinates(obj):
     except Exception as e:
         return f'error parsing coordinates: {str(e)}'
 
-def format_timestamp(timestamp):
+def format_xyz(obj: Any) -> str:
+    """Formats the x, y and z entries of a compound without the checks of format_coordinates"""
+    get = obj.get
+    return f"{get('x', '?')} x {get('y', '?')} x {get('z', '?')}"
+
+def tag_length(compound: Any, key: str, fast: bool = False) -> Optional[int]:
+    """Returns the length of a tag or None if it has no length, fast mode reads it from the tag header of lazy compounds"""
+    if fast and isinstance(compound, nbt_lazy.LazyCompound):
+        return compound.value_len(key)
+    value = compound[key]
+    return len(value) if hasattr(value, '__len__') else None
+
+def format_timestamp(timestamp: Any) -> str:
     """Format a timestamp as a readable date"""
     try:
         if isinstance(timestamp, (int, float)):
             date = datetime.datetime.fromtimestamp(timestamp / 1000)  # Minecraft timestamps are in milliseconds
-            return f"{timestamp} ({date.strftime('%Y-%m-%d %H:%M:%S')})"
+            return f"{timestamp} ({date.isoformat(sep=' ', timespec='seconds')})"
         return safe_to_string(timestamp)
     except Exception as e:
         return f"{timestamp} (error formatting date: {str(e)})"
 
-def safe_check(obj, key):
-    """Safely check if a key exists in an object"""
-    try:
-        return key in obj
-    except:
-        return False
+def safe_check(obj: Any, key: str) -> bool:
+    """Safely check if a key exists in an object, compounds (nbtlib or lazy) are dicts"""
+    return isinstance(obj, dict) and key in obj
+
+def decompress_stream(data: Any) -> memoryview:
+    """
+    Decompresses gzip data in chunks into a buffer that grows by doubling, returns a memoryview of the data
+    
+    Like gzip.decompress, concatenated members are decoded one after another and
+    zero padding after a member is skipped, anything else after it raises.
+    The buffer is kept for the next file decompressed by the same thread, so the
+    returned view is only valid until then
+    """
+    buffer = getattr(_buffers, 'output', None)
+    if buffer is None:
+        buffer = bytearray(OUTPUT_BUFFER_SIZE)
+    size = 0
+    decompressor = _zl.decompressobj(GZIP_WBITS)
+    for start in range(0, len(data), READ_BUFFER_SIZE):
+        pending = data[start:start + READ_BUFFER_SIZE]
+        while pending:
+            if decompressor.eof:
+                # Another member or padding follows the one that just ended
+                pending = bytes(pending).lstrip(b"\x00")
+                if not pending:
+                    break
+                if pending[:2] != GZIP_MAGIC[:len(pending)]:
+                    raise gzip.BadGzipFile(f"Not a gzipped file ({pending[:2]!r})")
+                decompressor = _zl.decompressobj(GZIP_WBITS)
+            chunk = decompressor.decompress(pending)
+            # Only left over once a member has ended inside this slice
+            pending = decompressor.unused_data
+            end = size + len(chunk)
+            if end > len(buffer):
+                # Grow into a new buffer, views from the previous file may still pin the old one
+                new_size = len(buffer) * 2
+                while end > new_size:
+                    new_size *= 2
+                grown = bytearray(new_size)
+                grown[:size] = memoryview(buffer)[:size]
+                buffer = grown
+            buffer[size:end] = chunk
+            size = end
+    _buffers.output = buffer
+    if not decompressor.eof:
+        raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+    return memoryview(buffer)[:size]
 
-def analyze_schematic(file_path, output_file=None):
+class MemoryViewReader:
+    """Minimal file-like object over a buffer, read() only copies the requested bytes"""
+    
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.pos = 0
+    
+    def read(self, size=-1):
+        start = self.pos
+        end = len(self.view) if size is None or size < 0 else min(start + size, len(self.view))
+        self.pos = max(start, end)
+        return self.view[start:end].tobytes()
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.pos = max(offset, 0)
+        return self.pos
+    
+    def tell(self):
+        return self.pos
+
+def analyze_schematic(file_path: Union[str, 'os.PathLike[str]'], log: Optional[TextIO] = None, full: bool = False, fast: bool = False) -> Tuple[Dict[str, Any], str]:
     """
     Analyzes a Minecraft schematic file and returns the information
     
     Args:
         file_path: Path to the schematic file
-        output_file: Optional file to write the output to
+        log: Optional open text file to write the output to
+        full: Whether to list every block type of the palette
+        fast: Only report sizes, format, dimensions and block counts, measuring
+            arrays and lists from their headers instead of decoding them
     
     Returns:
-        dict: Information about the schematic file
+        dict: Information about the schematic file, values read from the NBT data
+            are copied so the dict stays valid after the next call reuses the
+            decompression buffer
     """
-    result = {
-        "file_name": os.path.basename(file_path),
+    file_name = os.path.basename(file_path)
+    file_size = os.stat(file_path).st_size
+    
+    result: Dict[str, Any] = {
+        "file_name": file_name,
         "file_path": str(file_path),
-        "file_size": os.path.getsize(file_path),
-        "analysis_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "file_size": file_size,
+        "analysis_time": datetime.datetime.now().isoformat(sep=' ', timespec='seconds'),
     }
     
-    output = []
-    output.append(f"\n=== Analyzing file: {os.path.basename(file_path)} ===")
-    output.append(f"File path: {file_path}")
-    output.append(f"File size: {os.path.getsize(file_path)} bytes")
+    # Lines are written straight into one buffer instead of being joined at the end
+    buf = io.StringIO()
+    def out(line):
+        if buf.tell():
+            buf.write("\n")
+        buf.write(line)
+    
+    out(f"\n=== Analyzing file: {file_name} ===")
+    out(f"File path: {file_path}")
+    out(f"File size: {file_size} bytes")
     
     try:
-        # Read the file
         with open(file_path, 'rb') as f:
-            raw_data = f.read()
-        
-        # Check if the file is gzipped
-        is_gzipped = raw_data[0] == 0x1f and raw_data[1] == 0x8b
-        output.append(f"File compression: {'gzipped' if is_gzipped else 'not gzipped'}")
-        result["compression"] = "gzipped" if is_gzipped else "not gzipped"
-        
-        # Decompress if needed
-        if is_gzipped:
-            try:
-                file_data = gzip.decompress(raw_data)
-                output.append(f"Decompressed size: {len(file_data)} bytes")
-                result["decompressed_size"] = len(file_data)
-            except Exception as e:
-                output.append(f"Error decompressing file: {str(e)}")
-                result["error"] = f"Error decompressing file: {str(e)}"
-                return result, "\n".join(output)
-        else:
-            file_data = raw_data
+            # Check if the file is gzipped
+            is_gzipped = f.read(2) == GZIP_MAGIC
+            out(f"File compression: {'gzipped' if is_gzipped else 'not gzipped'}")
+            result["compression"] = "gzipped" if is_gzipped else "not gzipped"
+            
+            # Decompress if needed
+            if is_gzipped:
+                try:
+                    # Map the file so pages are only loaded as the decompressor reads them
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as raw_data:
+                        file_data: Union[memoryview, bytes] = decompress_stream(raw_data)
+                    out(f"Decompressed size: {len(file_data)} bytes")
+                    result["decompressed_size"] = len(file_data)
+                except Exception as e:
+                    out(f"Error decompressing file: {str(e)}")
+                    result["error"] = f"Error decompressing file: {str(e)}"
+                    result["error_type"] = type(e).__name__
+                    return result, buf.getvalue()
+            else:
+                # The lazy reader keeps referencing the data, so a mapping would have to be copied anyway
+                f.seek(0)
+                file_data = f.read()
         
         # Parse the NBT data
         try:
-            # Use BytesIO to create a file-like object
-            file_obj = BytesIO(file_data)
-            nbt_data = nbtlib.File.parse(file_obj)
-            output.append(f"NBT format: {nbt_data.gzipped}")
+            try:
+                # Only record where each tag lives, values are decoded when they are looked up
+                nbt_data = nbt_lazy.parse(file_data)
+            except Exception:
+                # Fall back to nbtlib, which also reports the clearer error
+                file_obj = MemoryViewReader(file_data)
+                nbt_data = nbtlib.File.parse(file_obj)
+            out(f"NBT format: {nbt_data.gzipped}")
         except Exception as e:
-            output.append(f"Error parsing NBT data: {str(e)}")
+            out(f"Error parsing NBT data: {str(e)}")
             result["error"] = f"Error parsing NBT data: {str(e)}"
-            return result, "\n".join(output)
+            result["error_type"] = type(e).__name__
+            return result, buf.getvalue()
         
         # Get the root structure
         schematic = nbt_data.get('Schematic', nbt_data)
         
+        # Look up the top level keys and the values checked more than once a single time
+        top_keys = frozenset(schematic.keys())
+        blocks_sub: Any = schematic.get('Blocks') if 'Blocks' in top_keys else None
+        # Metadata isn't reported in fast mode
+        meta: Any = schematic.get('Metadata') if not fast else None
+        we = meta.get('WorldEdit') if is_compound(meta) else None
+        
         # Determine the format
         format_type = "unknown"
         
         # Check for modern WorldEdit format (.schem)
-        if safe_check(schematic, 'Palette') and safe_check(schematic, 'BlockData'):
+        if MODERN_KEYS <= top_keys:
             format_type = "modern_worldedit"
         # Check for nested modern WorldEdit format
-        elif safe_check(schematic, 'Blocks') and isinstance(schematic.get('Blocks'), dict) and safe_check(schematic.get('Blocks', {}), 'Palette'):
+        elif isinstance(blocks_sub, dict) and 'Palette' in blocks_sub:
             format_type = "modern_worldedit_nested"
         # Check for alternate modern format
-        elif safe_check(schematic, 'BlockData') or safe_check(schematic, 'blocks'):
+        elif not ALTERNATE_KEYS.isdisjoint(top_keys):
             format_type = "modern_alternate"
         # Check for classic WorldEdit format (.schematic)
-        elif safe_check(schematic, 'Blocks') and safe_check(schematic, 'Data'):
+        elif CLASSIC_KEYS <= top_keys:
             format_type = "classic_worldedit"
         # Check for litematica format (.litematic)
-        elif safe_check(schematic, 'Regions'):
+        elif 'Regions' in top_keys:
             format_type = "litematica"
         
-        output.append(f"Format: {format_type}")
+        out(f"Format: {format_type}")
         result["format"] = format_type
         
         # Display dimensions
         if format_type == "litematica":
             # Litematica format has regions with their own dimensions
-            output.append("\nRegions:")
+            out("\nRegions:")
             result["regions"] = {}
             
             regions = schematic.get('Regions', {})
             for region_name, region in regions.items():
-                output.append(f"  - {region_name}:")
-                region_info = {}
-                
-                # Size and Position
-                if safe_check(region, 'Size'):
-                    size = region['Size']
-                    size_str = f"{size.get('x', '?')} x {size.get('y', '?')} x {size.get('z', '?')}"
-                    output.append(f"    Size: {size_str}")
-                    region_info["size"] = size_str
-                
-                if safe_check(region, 'Position'):
-                    pos = region['Position']
-                    pos_str = f"{pos.get('x', '?')} x {pos.get('y', '?')} x {pos.get('z', '?')}"
-                    output.append(f"    Position: ({pos_str})")
-                    region_info["position"] = pos_str
-                
-                # Add block entity information if available
-                if safe_check(region, 'BlockEntities'):
-                    block_entities = region['BlockEntities']
-                    if block_entities:
-                        output.append(f"    Block Entities: {len(block_entities)}")
-                        region_info["block_entities_count"] = len(block_entities)
-                
-                # Add entity information if available
-                if safe_check(region, 'Entities'):
-                    entities = region['Entities']
-                    if entities:
-                        output.append(f"    Entities: {len(entities)}")
-                        region_info["entities_count"] = len(entities)
+                out(f"  - {region_name}:")
+                region_info: Dict[str, Any] = {}
+                # Regions that aren't compounds are still listed, just without any details
+                if is_compound(region):
+                    rg = region.get
+                    
+                    # Size and Position
+                    if safe_check(region, 'Size'):
+                        size_str = format_xyz(rg('Size'))
+                        out(f"    Size: {size_str}")
+                        region_info["size"] = size_str
+                    
+                    if safe_check(region, 'Position'):
+                        pos_str = format_xyz(rg('Position'))
+                        out(f"    Position: ({pos_str})")
+                        region_info["position"] = pos_str
+                    
+                    # Add block entity information if available
+                    if safe_check(region, 'BlockEntities'):
+                        block_entities_count = tag_length(region, 'BlockEntities', fast)
+                        if block_entities_count:
+                            out(f"    Block Entities: {block_entities_count}")
+                            region_info["block_entities_count"] = block_entities_count
+                    
+                    # Add entity information if available
+                    if safe_check(region, 'Entities'):
+                        entities_count = tag_length(region, 'Entities', fast)
+                        if entities_count:
+                            out(f"    Entities: {entities_count}")
+                            region_info["entities_count"] = entities_count
                 
                 result["regions"][region_name] = region_info
         else:
-            # Other formats have direct width/height/length
-            width = schematic.get('Width', schematic.get('width', 0))
-            height = schematic.get('Height', schematic.get('height', 0))
-            length = schematic.get('Length', schematic.get('length', 0))
+            # Other formats have direct width/height/length, copied as they end up in the result
+            width = nbt_lazy.detach(schematic.get('Width', schematic.get('width', 0)))
+            height = nbt_lazy.detach(schematic.get('Height', schematic.get('height', 0)))
+            length = nbt_lazy.detach(schematic.get('Length', schematic.get('length', 0)))
             
             dimensions = f"{width} x {height} x {length}"
-            output.append(f"Dimensions: {dimensions}")
+            out(f"Dimensions: {dimensions}")
             total_volume = width * height * length if width and height and length else 0
-            output.append(f"Total volume: {total_volume} blocks")
+            out(f"Total volume: {total_volume} blocks")
             
             result["dimensions"] = {
                 "width": width,
@@ -187,37 +376,45 @@ def analyze_schematic(file_path, output_file=None):
         # Display block statistics
         if format_type.startswith("modern_worldedit"):
             # Modern WorldEdit format (.schem)
-            if safe_check(schematic, 'Palette'):
+            if 'Palette' in top_keys:
                 palette = schematic['Palette']
                 block_count = len(palette)
-                output.append(f"\nBlock types: {block_count}")
-                output.append("All block types:")
-                
-                block_types = []
-                try:
-                    for block_name, block_id in palette.items():
-                        output.append(f"  - {block_name} (ID: {block_id})")
-                        block_types.append({"name": block_name, "id": block_id})
-                except Exception as e:
-                    output.append(f"Error listing block types: {str(e)}")
-                
+                out(f"\nBlock types: {block_count}")
                 result["block_stats"] = {
-                    "total_block_types": block_count,
-                    "blocks": block_types
+                    "total_block_types": block_count
                 }
                 
+                # Palettes can hold tens of thousands of entries, only list them when asked to
+                if full:
+                    out("All block types:")
+                    names = []
+                    ids = []
+                    try:
+                        for block_name, block_id in palette.items():
+                            names.append(block_name)
+                            ids.append(nbt_lazy.detach(block_id))
+                        if names:
+                            out("\n".join(f"  - {block_name} (ID: {block_id})" for block_name, block_id in zip(names, ids)))
+                    except Exception as e:
+                        out(f"Error listing block types: {str(e)}")
+                    
+                    result["block_stats"]["blocks"] = {
+                        "names": names,
+                        "ids": ids
+                    }
+                
                 # Add BlockData information
-                if safe_check(schematic, 'BlockData'):
-                    block_data = schematic['BlockData']
-                    if hasattr(block_data, '__len__'):
-                        output.append(f"\nBlock data size: {len(block_data)} bytes")
-                        result["block_data_size"] = len(block_data)
+                if 'BlockData' in top_keys:
+                    block_data_size = tag_length(schematic, 'BlockData', fast)
+                    if block_data_size is not None:
+                        out(f"\nBlock data size: {block_data_size} bytes")
+                        result["block_data_size"] = block_data_size
         elif format_type == "classic_worldedit":
             # Classic WorldEdit format (.schematic)
-            output.append("\nBlock data available (classic format)")
-            if safe_check(schematic, 'Blocks'):
+            out("\nBlock data available (classic format)")
+            if 'Blocks' in top_keys:
                 # Handle different types of Blocks data
-                blocks = schematic['Blocks']
+                blocks = blocks_sub
                 try:
                     if hasattr(blocks, 'shape') and blocks.shape:
                         # It's a numpy array
@@ -230,42 +427,41 @@ def analyze_schematic(file_path, output_file=None):
                 except:
                     total_blocks = "unknown (error determining size)"
                 
-                output.append(f"Total blocks: {total_blocks}")
+                out(f"Total blocks: {total_blocks}")
                 result["block_stats"] = {
                     "total_blocks": total_blocks
                 }
                 
                 # Add Data information
-                if safe_check(schematic, 'Data'):
-                    data = schematic['Data']
-                    if hasattr(data, '__len__'):
-                        output.append(f"Block data size: {len(data)} bytes")
-                        result["block_data_size"] = len(data)
+                if 'Data' in top_keys:
+                    block_data_size = tag_length(schematic, 'Data', fast)
+                    if block_data_size is not None:
+                        out(f"Block data size: {block_data_size} bytes")
+                        result["block_data_size"] = block_data_size
                 
                 # Add TileEntities information
-                if safe_check(schematic, 'TileEntities'):
-                    tile_entities = schematic['TileEntities']
-                    if hasattr(tile_entities, '__len__'):
-                        output.append(f"Tile entities: {len(tile_entities)}")
-                        result["tile_entities_count"] = len(tile_entities)
+                if 'TileEntities' in top_keys:
+                    tile_entities_count = tag_length(schematic, 'TileEntities', fast)
+                    if tile_entities_count is not None:
+                        out(f"Tile entities: {tile_entities_count}")
+                        result["tile_entities_count"] = tile_entities_count
                 
                 # Add Entities information
-                if safe_check(schematic, 'Entities'):
-                    entities = schematic['Entities']
-                    if hasattr(entities, '__len__'):
-                        output.append(f"Entities: {len(entities)}")
-                        result["entities_count"] = len(entities)
+                if 'Entities' in top_keys:
+                    entities_count = tag_length(schematic, 'Entities', fast)
+                    if entities_count is not None:
+                        out(f"Entities: {entities_count}")
+                        result["entities_count"] = entities_count
         elif format_type == "litematica":
             # Litematica format
-            output.append("\nBlock data available in regions")
+            out("\nBlock data available in regions")
         
         # Display metadata if available
-        if safe_check(schematic, 'Metadata'):
-            output.append("\nMetadata:")
+        if meta is not None:
+            out("\nMetadata:")
             result["metadata"] = {}
             
-            metadata = schematic['Metadata']
-            for key, value in metadata.items():
+            for key, value in meta.items():
                 # Skip WorldEdit metadata as we'll handle it separately
                 if key == 'WorldEdit':
                     continue
@@ -273,95 +469,104 @@ def analyze_schematic(file_path, output_file=None):
                 # Handle object values properly
                 if key == 'EnclosingSize' and isinstance(value, dict):
                     coord_str = format_coordinates(value)
-                    output.append(f"  {key}: {coord_str}")
+                    out(f"  {key}: {coord_str}")
                     result["metadata"][key] = coord_str
                 elif key in ('TimeCreated', 'TimeModified'):
                     # Format timestamps as dates
                     time_str = format_timestamp(value)
-                    output.append(f"  {key}: {time_str}")
+                    out(f"  {key}: {time_str}")
                     result["metadata"][key] = time_str
                 elif isinstance(value, dict):
-                    output.append(f"  {key}: [complex object]")
+                    out(f"  {key}: [complex object]")
                     # Try to extract more information from the complex object
                     try:
-                        output.append(f"    Keys: {', '.join(value.keys())}")
+                        out(f"    Keys: {', '.join(value.keys())}")
                         result["metadata"][key] = {"keys": list(value.keys())}
                     except:
                         result["metadata"][key] = "complex object"
                 else:
-                    output.append(f"  {key}: {safe_to_string(value)}")
+                    out(f"  {key}: {safe_to_string(value)}")
                     result["metadata"][key] = safe_to_string(value)
         
         # Handle WorldEdit metadata separately
-        if safe_check(schematic, 'Metadata') and safe_check(schematic['Metadata'], 'WorldEdit'):
-            output.append("\nWorldEdit Metadata:")
+        if we is not None:
+            out("\nWorldEdit Metadata:")
             result["worldedit_metadata"] = {}
             
-            we_metadata = schematic['Metadata']['WorldEdit']
-            for key, value in we_metadata.items():
+            for key, value in we.items():
                 if key == 'Origin' and isinstance(value, dict):
                     coord_str = format_coordinates(value)
-                    output.append(f"  {key}: {coord_str}")
+                    out(f"  {key}: {coord_str}")
                     result["worldedit_metadata"][key] = coord_str
                 elif isinstance(value, dict):
-                    output.append(f"  {key}: [complex object]")
+                    out(f"  {key}: [complex object]")
                     # Try to extract more information from the complex object
                     try:
-                        output.append(f"    Keys: {', '.join(value.keys())}")
+                        out(f"    Keys: {', '.join(value.keys())}")
                         result["worldedit_metadata"][key] = {"keys": list(value.keys())}
                     except:
                         result["worldedit_metadata"][key] = "complex object"
                 else:
-                    output.append(f"  {key}: {safe_to_string(value)}")
+                    out(f"  {key}: {safe_to_string(value)}")
                     result["worldedit_metadata"][key] = safe_to_string(value)
         
-        # Add additional NBT data information
-        output.append("\nAdditional NBT Data:")
-        additional_keys = []
-        for key in schematic.keys():
-            if key not in ['Palette', 'BlockData', 'Blocks', 'Data', 'Regions', 'Metadata']:
-                additional_keys.append(key)
-                value = schematic[key]
-                if isinstance(value, dict):
-                    output.append(f"  {key}: [complex object]")
-                    try:
-                        output.append(f"    Keys: {', '.join(value.keys())}")
-                    except:
-                        pass
-                else:
-                    output.append(f"  {key}: {safe_to_string(value)}")
+        # Add additional NBT data information, skipped in fast mode
+        if not fast:
+            out("\nAdditional NBT Data:")
+            additional_keys = []
+            for key in schematic.keys():
+                if key not in ['Palette', 'BlockData', 'Blocks', 'Data', 'Regions', 'Metadata']:
+                    additional_keys.append(key)
+                    value = schematic[key]
+                    if isinstance(value, dict):
+                        out(f"  {key}: [complex object]")
+                        try:
+                            out(f"    Keys: {', '.join(value.keys())}")
+                        except:
+                            pass
+                    else:
+                        out(f"  {key}: {safe_to_string(value)}")
         
-        if not additional_keys:
-            output.append("  No additional NBT data found")
-        else:
-            result["additional_nbt_keys"] = additional_keys
+            if not additional_keys:
+                out("  No additional NBT data found")
+            else:
+                result["additional_nbt_keys"] = additional_keys
         
-        output.append("\n=== End of analysis ===")
+        out("\n=== End of analysis ===")
         
     except Exception as e:
         error_msg = f"Error analyzing file: {str(e)}"
-        output.append(error_msg)
+        out(error_msg)
         # Add traceback for debugging
-        output.append(traceback.format_exc())
+        if DEBUG:
+            out(traceback.format_exc())
         result["error"] = error_msg
+        result["error_type"] = type(e).__name__
+    finally:
+        text = buf.getvalue()
+        
+        # Write to output file if specified, the early returns on errors end up here as well
+        if log:
+            log.write(text)
+            log.write("\n\n")
     
-    # Write to output file if specified
-    if output_file:
-        with open(output_file, 'a', encoding='utf-8') as f:
-            f.write("\n".join(output) + "\n\n")
-    
-    return result, "\n".join(output)
+    return result, text
+
+def _analyze_worker(file_path, full=False, fast=False):
+    """Analyzes a single file in a worker process, the log is written by the caller"""
+    return analyze_schematic(file_path, None, full, fast)
 
-def process_directory(dir_path, output_file=None, json_output=None):
-    """Process all supported files in a directory"""
+def process_directory(dir_path, log=None, json_output=None, full=False, fast=False):
+    """Process all supported files in a directory, writing the output to the open log if given"""
     try:
         dir_path = Path(dir_path)
         if not dir_path.exists() or not dir_path.is_dir():
             print(f"Directory not found: {dir_path}")
             return
         
-        supported_extensions = ['.schem', '.schematic', '.litematic']
-        files = [f for f in dir_path.iterdir() if f.is_file() and f.suffix.lower() in supported_extensions]
+        # DirEntry already knows the file type from the directory listing, so no stat per entry
+        with os.scandir(dir_path) as entries:
+            files = [entry.path for entry in entries if entry.is_file() and os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS]
         
         if not files:
             print(f"No supported files found in {dir_path}")
@@ -369,27 +574,38 @@ def process_directory(dir_path, output_file=None, json_output=None):
         
         print(f"Found {len(files)} supported files in {dir_path}")
         
-        results = []
-        for file_path in files:
-            result, output_text = analyze_schematic(file_path, output_file)
-            # Print the output to the terminal
-            print(output_text)
-            results.append(result)
+        # Write JSON output if specified, one result at a time as they come in
+        with open(json_output, 'wb') if json_output else nullcontext() as f:
+            json_writer = JsonArrayWriter(f) if f else None
+            
+            try:
+                # Files are independent and parsing is CPU bound, so spread them over processes
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    for result, output_text in executor.map(partial(_analyze_worker, full=full, fast=fast), files, chunksize=4):
+                        # Print the output to the terminal
+                        print(output_text)
+                        if log:
+                            log.write(output_text)
+                            log.write("\n\n")
+                        if json_writer:
+                            json_writer.write(result)
+            finally:
+                # Terminate the array even if a worker failed, so the results so far stay valid JSON
+                if json_writer:
+                    json_writer.close()
         
-        # Write JSON output if specified
         if json_output:
-            with open(json_output, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2)
             print(f"JSON data written to {json_output}")
         
     except Exception as e:
         print(f"Error processing directory: {str(e)}")
-        print(traceback.format_exc())
+        if DEBUG:
+            print(traceback.format_exc())
 
 def main():
     """Main function to handle command line arguments"""
     if len(sys.argv) < 2:
-        print("Usage: python schemInfoPy.py <file_path_or_directory> [--log <log_file>] [--json <json_file>] [--full]")
+        print("Usage: python schemInfoPy.py <file_path_or_directory> [--log <log_file>] [--json <json_file>] [--full] [--fast]")
         print("Supported formats: .schem, .schematic, .litematic")
         sys.exit(1)
     
@@ -398,6 +614,8 @@ def main():
     # Parse optional arguments
     log_file = None
     json_file = None
+    full = False
+    fast = False
     
     i = 2
     while i < len(sys.argv):
@@ -407,6 +625,12 @@ def main():
         elif sys.argv[i] == "--json" and i + 1 < len(sys.argv):
             json_file = sys.argv[i + 1]
             i += 2
+        elif sys.argv[i] == "--full":
+            full = True
+            i += 1
+        elif sys.argv[i] == "--fast":
+            fast = True
+            i += 1
         else:
             i += 1
     
@@ -419,28 +643,28 @@ def main():
     if json_file is None and log_file:
         json_file = log_file.rsplit('.', 1)[0] + ".json"
     
-    # Clear the log file if it exists
-    if log_file:
-        with open(log_file, 'w', encoding='utf-8') as f:
-            f.write(f"Schematic Analysis Log - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Command: {' '.join(sys.argv)}\n\n")
-    
-    # Process file or directory
-    path = Path(file_path)
-    if path.is_dir():
-        process_directory(path, log_file, json_file)
-    elif path.is_file():
-        result, output_text = analyze_schematic(path, log_file)
-        # Print the output to the terminal
-        print(output_text)
+    # Clear the log file if it exists and keep it open for the whole run
+    with open(log_file, 'w', buffering=LOG_BUFFER_SIZE, encoding='utf-8') if log_file else nullcontext() as log:
+        if log:
+            log.write(f"Schematic Analysis Log - {datetime.datetime.now().isoformat(sep=' ', timespec='seconds')}\n")
+            log.write(f"Command: {' '.join(sys.argv)}\n\n")
         
-        # Write JSON output if specified
-        if json_file:
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump([result], f, indent=2)
-            print(f"JSON data written to {json_file}")
-    else:
-        print(f"File or directory not found: {file_path}")
+        # Process file or directory
+        path = Path(file_path)
+        if path.is_dir():
+            process_directory(path, log, json_file, full, fast)
+        elif path.is_file():
+            result, output_text = analyze_schematic(path, log, full, fast)
+            # Print the output to the terminal
+            print(output_text)
+            
+            # Write JSON output if specified
+            if json_file:
+                with open(json_file, 'wb') as f:
+                    f.write(dump_json([result]))
+                print(f"JSON data written to {json_file}")
+        else:
+            print(f"File or directory not found: {file_path}")
 
 # Add a function to print detailed information about a specific block type
 def print_block_details(block_name, block_data):